@@ -0,0 +1,287 @@
+"""
+Text-to-image rendering for the cat printer.
+
+Shared by the catprint-text CLI and the standalone print_text.py script,
+so the text pipeline only exists (and only gets optimized) in one place.
+"""
+import string
+from functools import lru_cache
+
+# PIL is imported lazily inside the functions below: loading its C
+# extensions costs real time on every interpreter start, and e.g.
+# `catprint-text --help` never needs them.
+
+# Glyph advance widths memoized per font, keyed by id(font) since font
+# objects are not hashable. Shared across convert_text_to_image calls so
+# repeated characters are only ever measured once per font.
+_WIDTH_CACHE = {}
+
+# Candidate system fonts: emoji-capable fonts first, then regular fonts.
+_FONT_PATHS = [
+    '/System/Library/Fonts/Apple Color Emoji.ttc',  # macOS emoji font
+    '/System/Library/Fonts/Helvetica.ttc',  # macOS
+    '/System/Library/Fonts/Arial.ttf',  # macOS
+    '/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf',  # Linux emoji
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',  # Linux
+    'C:\\Windows\\Fonts\\seguiemj.ttf',  # Windows emoji
+    'C:\\Windows\\Fonts\\arial.ttf',  # Windows
+]
+
+# Path that last yielded a usable font, so loading another size skips the
+# scan over the whole candidate list.
+_found_font_path = None
+
+
+@lru_cache(maxsize=8)
+def _load_font(font_size):
+    """Find and load a system font at the given size, preferring emoji fonts.
+
+    Memoized per size; discovery runs once per process.
+    """
+    from PIL import ImageFont
+
+    global _found_font_path
+    if _found_font_path:
+        try:
+            font = ImageFont.truetype(_found_font_path, font_size)
+        except OSError:
+            # The remembered path can fail at a new size — bitmap-strike
+            # fonts like Apple Color Emoji only load at fixed sizes — so
+            # forget it and fall through to the full candidate scan.
+            _found_font_path = None
+        else:
+            print(f"Using font: {_found_font_path}")
+            return font
+
+    font = None
+    emoji_font = None
+    for font_path in _FONT_PATHS:
+        # EAFP: let truetype() fail on missing or unreadable paths rather
+        # than statting each candidate first — one syscall instead of two,
+        # and no TOCTOU window.
+        try:
+            test_font = ImageFont.truetype(font_path, font_size)
+        except OSError:
+            continue
+        if 'emoji' in font_path.lower() or 'color' in font_path.lower():
+            if emoji_font is None:
+                emoji_font = test_font
+                print(f"Found emoji font: {font_path}")
+        elif font is None:  # Use first regular font found
+            font = test_font
+            print(f"Using font: {font_path}")
+
+    # Prefer emoji font if available, otherwise use regular font
+    if emoji_font is not None:
+        font = emoji_font
+    if font is None:
+        # Fall back to default font
+        print("Warning: Using default font, no system fonts found")
+        return ImageFont.load_default()
+    _found_font_path = font.path if hasattr(font, 'path') else None
+    return font
+
+
+def _glyph_width(font, ch, measure):
+    cache = _WIDTH_CACHE.setdefault(id(font), {})
+    w = cache.get(ch)
+    if w is None:
+        w = cache[ch] = measure(ch)
+    return w
+
+
+# Widest printable-ASCII advance per font, keyed like _WIDTH_CACHE. A sound
+# per-character upper bound for deciding that an ASCII line cannot overflow;
+# 'M' alone is not one ('W', 'm' and '@' are all wider in common fonts).
+_MAX_ADVANCE_CACHE = {}
+
+
+def _max_advance(font):
+    w = _MAX_ADVANCE_CACHE.get(id(font))
+    if w is None:
+        w = _MAX_ADVANCE_CACHE[id(font)] = max(
+            font.getlength(c) for c in string.printable
+        )
+    return w
+
+
+def _render_text_image(text_file, font_size=16, width=384):
+    """Render a text file into a 1-bit PIL image using PIL for better text control.
+
+    Returns the image, or None on failure. Rendering straight into mode
+    '1' is lossless for black-on-white text and uses a third of the
+    memory (and pixel bandwidth) of an RGB canvas.
+    """
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    try:
+        # Font discovery and the FreeType face are memoized, so repeated
+        # invocations at the same size skip the filesystem scan entirely.
+        font = _load_font(font_size)
+
+        # Function to wrap text to fit within printer width. All measurement
+        # goes through font.getlength (Pillow >= 9.2) and font.getmetrics,
+        # so no scratch image or drawing context is needed.
+        def wrap_text_to_width(text, font, max_width):
+            measure = font.getlength
+
+            # Fast paths: a line without spaces cannot be split, and most
+            # lines simply fit — one whole-string measurement then replaces
+            # the entire per-word pass.
+            if ' ' not in text or measure(text) <= max_width:
+                return [text]
+
+            # Build cumulative widths of space-joined prefixes, summing
+            # cached per-character advance widths so each distinct glyph hits
+            # FreeType at most once per font. (Ignoring kerning slightly
+            # overestimates some words, which is harmless for wrapping.) The
+            # prefix-width accumulation runs as a numpy kernel; the break
+            # search below is a pure-Python DP over those sums. No candidate
+            # line is ever joined or re-measured. One whitespace split per
+            # paragraph is the only tokenization: runs of spaces collapse,
+            # so no zero-width tokens are carried through the arithmetic.
+            # (Lines that fit never get here and keep their spacing as-is.)
+            words = text.split()
+            space_w = _glyph_width(font, ' ', measure)
+            word_widths = np.fromiter(
+                (sum(_glyph_width(font, c, measure) for c in w) for w in words),
+                dtype=np.float64,
+                count=len(words),
+            )
+            prefix = np.cumsum(word_widths)
+            prefix += np.arange(len(words)) * space_w
+            # The DP below reads prefix one scalar at a time; a plain list is
+            # much cheaper to index than a numpy array.
+            prefix = prefix.tolist()
+
+            # Knuth-Plass style minimum-raggedness breaking: pick the break
+            # set minimizing the squared leftover width of every line except
+            # the last, rather than greedily filling each line. Measurement
+            # cost is unchanged (one prefix pass); lines pack tighter, and
+            # fewer lines means a shorter image and less BLE data. The scan
+            # over line starts is bounded by how many words fit on a line.
+            n = len(words)
+            best = [0.0] + [float('inf')] * n  # best[i]: cost of words[:i]
+            back = [0] * (n + 1)               # chosen break before words[i:]
+            for j in range(1, n + 1):
+                for i in range(j - 1, -1, -1):
+                    # Width of the line words[i:j].
+                    line_w = prefix[j - 1] - (prefix[i - 1] + space_w if i else 0.0)
+                    if line_w > max_width:
+                        if i == j - 1 and best[i] < best[j]:
+                            # A single word wider than the line: keep it
+                            # whole, matching the old always-add-at-least-
+                            # one-word rule.
+                            best[j], back[j] = best[i], i
+                        break
+                    cost = best[i] + (0.0 if j == n else (max_width - line_w) ** 2)
+                    if cost < best[j]:
+                        best[j], back[j] = cost, i
+
+            # Walk the chosen breaks back from the end and emit the lines.
+            breaks = []
+            j = n
+            while j > 0:
+                breaks.append(j)
+                j = back[j]
+            breaks.reverse()
+            lines = []
+            start = 0
+            for end in breaks:
+                lines.append(' '.join(words[start:end]))
+                start = end
+
+            return lines
+
+        # Process all text with wrapping, streaming the file line by line:
+        # the file object's internal buffering keeps reads sequential and
+        # memory stays flat no matter how large the input is.
+        available_width = width - 20  # Account for padding
+
+        # An ASCII line priced at the font's widest printable-ASCII advance
+        # per character that still fits genuinely cannot overflow, so it
+        # skips the wrap machinery — the common case for pre-formatted
+        # narrow text. Lines with wider (non-ASCII) glyphs fall through to
+        # wrap_text_to_width, whose fast path measures them exactly.
+        max_advance = _max_advance(font)
+
+        wrapped_lines = []
+        with open(text_file, 'r', buffering=1 << 16,
+                  encoding='utf-8', errors='replace') as f:
+            for original_line in f:
+                original_line = original_line.rstrip('\r\n')
+                if not original_line.strip():
+                    # Preserve empty lines
+                    wrapped_lines.append('')
+                elif (original_line.isascii()
+                        and len(original_line) * max_advance <= available_width):
+                    wrapped_lines.append(original_line)
+                else:
+                    # Wrap long lines to fit printer width
+                    wrapped = wrap_text_to_width(original_line, font, available_width)
+                    wrapped_lines.extend(wrapped)
+
+        # Match the old whole-document strip(): drop blank lines at the ends.
+        while wrapped_lines and not wrapped_lines[-1].strip():
+            wrapped_lines.pop()
+        while wrapped_lines and not wrapped_lines[0].strip():
+            wrapped_lines.pop(0)
+
+        if not wrapped_lines:
+            print("Error: Text file is empty")
+            return None
+
+        # Vertical metrics are fixed for a given font: one ascent + descent
+        # constant sizes the whole page, with no measurement pass over the
+        # wrapped lines.
+        try:
+            line_height = sum(font.getmetrics())
+        except AttributeError:
+            # Bitmap fallback font without metrics.
+            line_height = font_size
+
+        img_width = width  # Use full printer width
+        img_height = max(
+            len(wrapped_lines) * line_height + (len(wrapped_lines) - 1) * 5 + 20,
+            50,
+        )  # 5px line spacing plus padding, min 50px
+
+        # Create the actual image: 1 is white, 0 (the ink) is black
+        img = Image.new('1', (img_width, img_height), color=1)
+        draw = ImageDraw.Draw(img)
+
+        # Draw the whole page with one multiline_text call instead of one
+        # draw.text per line; PIL handles the Y advance internally, so N
+        # Python-to-C crossings become one. multiline_text steps by the
+        # height of 'A' plus `spacing`, so pad spacing to keep the exact
+        # line_height + 5 advance the image height was computed with.
+        try:
+            spacing = line_height + 5 - font.getbbox('A')[3]
+        except AttributeError:
+            spacing = 5
+        draw.multiline_text((10, 10), '\n'.join(wrapped_lines),
+                            fill=0, font=font, spacing=spacing)
+
+        print(f"Created image: {img_width}x{img_height} pixels")
+
+        return img
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+
+def convert_text_to_image(text_file, output_image, font_size=16, width=384):
+    """Convert a text file to an image using PIL for better text control."""
+    img = _render_text_image(text_file, font_size, width)
+    if img is None:
+        return False
+    try:
+        # The render is already 1-bit, so the PNG is written directly with
+        # no quantization step and stays small.
+        img.save(output_image, 'PNG')
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    return True